@@ -1,6 +1,71 @@
+import errno
+import logging
+import os
+import queue
 import re
+import selectors
 import socket
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from urllib.parse import quote, unquote, urlsplit
+
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on concurrent sessions for multi-file 'cp'/'mv', to stay under per-user connection limits
+MAX_PARALLEL_TRANSFERS = 4
+
+# Matches the first line of a reply, capturing the code and the separator ('-' for multi-line)
+_REPLY_CODE_RE = re.compile(rb"^(\d{3})([ -])")
+# Matches the "h1,h2,h3,h4,p1,p2" address in a 227 reply to PASV. The parentheses around it
+# are not required, since RFC 1123 (4.1.2.6) says clients must not rely on them
+_PASV_RE = re.compile(r"(\d+),(\d+),(\d+),(\d+),(\d+),(\d+)")
+# Matches the "(|||port|)" part of a 229 reply to EPSV; the delimiter may be any character
+_EPSV_RE = re.compile(r"\((.)\1\1(\d+)\1\)")
+
+# Wire encoding of the fixed commands the client sends, so they are not formatted and encoded on every call
+_CMD_BYTES = {
+    command: f"{command}\r\n".encode()
+    for command in ("PASV", "EPSV", "TYPE I", "MODE S", "STRU F", "REIN", "QUIT")
+}
+
+
+def _interleave_families(addresses):
+    """
+    Reorders getaddrinfo() results so address families alternate, starting with the resolver's
+    preferred one (RFC 8305, section 4).
+
+    :param addresses: The getaddrinfo() results.
+    :return: The same results, with families interleaved.
+    """
+
+    by_family = {}
+    for address in addresses:
+        by_family.setdefault(address[0], []).append(address)
+    groups = list(by_family.values())
+    return [group[i] for i in range(max(map(len, groups))) for group in groups if i < len(group)]
+
+
+def _autotune_limit(name):
+    """
+    Reads the upper limit of Linux's TCP buffer autotuning from /proc/sys/net/ipv4.
+
+    :param name: 'tcp_rmem' for receive buffers or 'tcp_wmem' for send buffers.
+    :return: The limit in bytes, or None where it can't be read (e.g. not on Linux).
+    """
+
+    try:
+        with open(f"/proc/sys/net/ipv4/{name}") as file:
+            return int(file.read().split()[2])
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+# How far the kernel autotunes each socket buffer by itself, or None if unknown
+_AUTOTUNE_LIMITS = {
+    socket.SO_SNDBUF: _autotune_limit("tcp_wmem"),
+    socket.SO_RCVBUF: _autotune_limit("tcp_rmem"),
+}
 
 
 class FTPClient:
@@ -9,50 +74,221 @@ class FTPClient:
     list directory, upload, download, delete, and manage directories.
     """
 
-    def __init__(self, operation, params):
+    # Chunk size for reads and writes on the data channel
+    BUFSIZE = 1 << 16
+    # Minimum kernel send/receive buffer size for data sockets
+    SOCKET_BUFSIZE = 1 << 20
+    # Write buffer size for downloaded files, so short socket reads are coalesced into large disk writes
+    FILE_BUFSIZE = 1 << 20
+    # Head start, in seconds, given to each connection attempt before racing the next address (RFC 8305)
+    CONNECT_ATTEMPT_DELAY = 0.25
+
+    def __init__(self, server="ftp.3700.network", port=21):
+        """
+        Initializes the FTPClient and opens the control connection to the FTP server.
+
+        The connection stays open across operations until close() is called, so a single
+        login can be reused; the client can also be used as a context manager.
+
+        :param server: The hostname of the FTP server.
+        :param port: The port of the FTP server's control channel.
+        """
+        self.server = server
+        self.port = port
+        self.logged_in = False
+        # The user this session is logged in as, so a request for a different user isn't run as this one
+        self.username = None
+        # Session parameter commands last accepted by the server, by verb (e.g. "TYPE": "TYPE I"),
+        # so repeated operations don't re-send them
+        self.parameters = {}
+        # Whether transfer commands can be pipelined behind PASV/EPSV (see open_data_connection)
+        self.pipeline_passive = False
+
+        # Establish control connection to the server, racing its IPv6 and IPv4 addresses
+        # AI_ADDRCONFIG skips address families this host has no configured address for
+        addresses = socket.getaddrinfo(self.server, self.port, type=socket.SOCK_STREAM, flags=socket.AI_ADDRCONFIG)
+        self.control_socket = self._connect(_interleave_families(addresses))
+        # The server's socket address; EPSV data connections go to the same host
+        self.peer_address = self.control_socket.getpeername()
+        # Buffered reader for the control channel so replies can be consumed line by line
+        self.ctrl_rfile = self.control_socket.makefile('rb', buffering=65536)
+        # Buffered writer for the control channel; commands are flushed at command boundaries
+        self.ctrl_wfile = self.control_socket.makefile('wb', buffering=8192)
+
+        # Read the server's greeting message
+        self.read_response()
+
+    def _tune_socket(self, sock, data_channel=False):
+        """
+        Applies the client's socket options. Must be called before connect(), since the TCP
+        window scale is negotiated from the receive buffer size during the handshake.
+
+        Buffer sizes are only raised on data sockets, and only when the kernel can't autotune them
+        up to SOCKET_BUFSIZE by itself: setting a size explicitly turns autotuning off for the
+        socket and is clamped to the kernel's configured maximum.
+
+        :param sock: The unconnected TCP socket to tune.
+        :param data_channel: Whether the socket carries file data rather than control commands.
+        """
+
+        if data_channel:
+            for option, autotune_limit in _AUTOTUNE_LIMITS.items():
+                if autotune_limit is not None and autotune_limit >= self.SOCKET_BUFSIZE:
+                    continue
+                if sock.getsockopt(socket.SOL_SOCKET, option) < self.SOCKET_BUFSIZE:
+                    sock.setsockopt(socket.SOL_SOCKET, option, self.SOCKET_BUFSIZE)
+        # Disable Nagle's algorithm so short writes are not held back waiting for ACKs
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def _connect(self, addresses):
+        """
+        Connects to the first reachable address, Happy Eyeballs style (RFC 8305): a new attempt
+        is started every CONNECT_ATTEMPT_DELAY seconds, or as soon as one fails, while earlier
+        attempts keep running, and the first to complete wins. An unreachable address family
+        therefore costs a fraction of a second instead of a full TCP timeout.
+
+        :param addresses: The getaddrinfo() results to try, in order of preference.
+        :return: The connected, tuned, blocking socket.
+        """
+
+        pending = list(addresses)
+        attempts = []
+        last_error = None
+        with selectors.DefaultSelector() as selector:
+            try:
+                while pending or attempts:
+                    if pending:
+                        family, sock_type, proto, _, address = pending.pop(0)
+                        sock = None
+                        try:
+                            sock = socket.socket(family, sock_type, proto)
+                            self._tune_socket(sock)
+                            sock.setblocking(False)
+                            result = sock.connect_ex(address)
+                            if result not in (0, errno.EINPROGRESS, errno.EWOULDBLOCK):
+                                raise OSError(result, os.strerror(result))
+                        except OSError as error:
+                            # Failed right away (e.g. family unsupported or no route); move on to the next address
+                            last_error = error
+                            if sock is not None:
+                                sock.close()
+                            continue
+                        selector.register(sock, selectors.EVENT_WRITE)
+                        attempts.append(sock)
+
+                    # Wait for an attempt to finish; with addresses left, only for the head start
+                    for key, _ in selector.select(self.CONNECT_ATTEMPT_DELAY if pending else None):
+                        sock = key.fileobj
+                        selector.unregister(sock)
+                        attempts.remove(sock)
+                        result = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                        if result == 0:
+                            sock.setblocking(True)
+                            return sock
+                        last_error = OSError(result, os.strerror(result))
+                        sock.close()
+            finally:
+                # Abandon the attempts that lost the race
+                for sock in attempts:
+                    sock.close()
+
+        raise last_error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Ends the session with QUIT and closes the control connection. Safe to call more than once.
+        """
+
+        if self.control_socket is None:
+            return
+        try:
+            # Send QUIT before closing the connection
+            self.send_quit()
+        except OSError:
+            # The connection is already gone, so there is no session left to end
+            pass
+        finally:
+            try:
+                self.ctrl_rfile.close()
+                # Closing flushes any unsent command, which fails again on a dead connection
+                self.ctrl_wfile.close()
+            except OSError:
+                pass
+            finally:
+                self.control_socket.close()
+                self.control_socket = None
+
+    def login(self, username, password):
+        """
+        Authenticates with the server and sets TYPE, MODE, and STRU for the session.
+        Does nothing if this connection is already logged in as the same user; if it is logged
+        in as a different user, the session is reinitialized with REIN first.
+
+        :param username: The username to log in with.
+        :param password: The password to log in with.
+        :return: True if the session is logged in as the given user, False otherwise.
+        """
+
+        if self.logged_in:
+            if username == self.username:
+                return True
+            # Switch users on the same connection; REIN resets the session's state on the server too
+            response = self.send_command("REIN")
+            if not response.startswith('2'):
+                logger.error("Already logged in as '%s' and could not log in as '%s'. Server response: %s",
+                             self.username, username, response.rstrip())
+                return False
+            self.logged_in = False
+            self.username = None
+            self.parameters = {}
+
+        # USER and PASS are pipelined to save a round trip; the server answers them in order
+        user_response, pass_response = self.pipeline_commands(f"USER {username}", f"PASS {password}")
+        # Some servers accept USER alone with 230, in which case PASS is answered with 503
+        self.logged_in = user_response.startswith('230') or pass_response.startswith('230')
+        if not self.logged_in:
+            logger.error("Failed to log in as '%s'. Server response: %s", username, pass_response.rstrip())
+            return False
+        self.username = username
+
+        # Set TYPE, MODE, and STRU right after successful login
+        self.set_parameters("TYPE I", "MODE S", "STRU F") # Binary mode, Stream mode, File structure
+        return True
+
+    def execute(self, operation, params):
         """
-        Initializes the FTPClient with a specific operation and parameters, then
-        executes the operation against the FTP server.
+        Executes an operation against the FTP server, logging in first with the credentials
+        from the operation's URL if this connection is not logged in yet.
 
         :param operation: The FTP operation to perform ('ls, 'rm', 'rmdir', 'mkdir', 'cp', 'mv').
         :param params: Parameters for the operation, such as paths or filenames.
         """
-        self.server = "ftp.3700.network"
-        self.port = 21
-        self.operation = operation
-        self.params = params
-
-        # Establish control connection to the server
-        self.control_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.control_socket.connect((self.server, self.port))
-
-        # Read and print the server's greeting message
-        print(self.read_response())
 
         # Parse URL to extract username, password, and path
         username, password, path = self.parse_url(operation, params)
 
         # Authenticate with the server using provided credentials
-        print(self.send_command(f"USER {username}"))
-        print(self.send_command(f"PASS {password}"))
-
-        # Set TYPE, MODE, and STRU right after successful login
-        self.send_type("I") # Binary mode for file transfer
-        self.send_mode("S") # Stream mode
-        self.send_stru("F") # File structure mode
+        if not self.login(username, password):
+            return
 
         # Depending on operation, call the respective method
         if operation == 'cp' or operation == 'mv':
-            if len(self.params) < 2:
-                print("Error: 'cp' and 'mv' operations require two arguments.")
+            if len(params) < 2:
+                logger.error("'cp' and 'mv' operations require two arguments.")
                 exit(1)
             if operation == 'cp':
-                self.send_cp(self.params[0], self.params[1])
+                self.send_cp(params[0], params[1])
             elif operation == 'mv':
-                self.send_mv(self.params[0], self.params[1])
+                self.send_mv(params[0], params[1])
         elif operation == 'rm':
-            if len(self.params) < 1:
-                print("Error: 'rm' operation requires a file path.")
+            if len(params) < 1:
+                logger.error("'rm' operation requires a file path.")
                 exit(1)
             self.send_dele(path)
         elif operation == 'ls':
@@ -62,9 +298,6 @@ class FTPClient:
         elif operation == 'rmdir':
             self.send_rmdir(path)
 
-        # Send QUIT before ending the program
-        self.send_quit()
-
     def send_command(self, command):
         """
         Sends a command to the FTP server and returns the server's response.
@@ -73,42 +306,94 @@ class FTPClient:
         :return: The server's response to the command.
         """
 
-        self.control_socket.sendall(f"{command}\r\n".encode())
+        self.write_commands(command)
         response = self.read_response()
         return response
 
+    def write_commands(self, *commands):
+        """
+        Sends one or more commands to the FTP server in a single flush, without reading any responses.
+
+        :param commands: The FTP commands to send.
+        """
+
+        # Buffer every command and flush once so they leave in as few segments as possible
+        for command in commands:
+            self.ctrl_wfile.write(_CMD_BYTES.get(command) or f"{command}\r\n".encode())
+        self.ctrl_wfile.flush()
+
+    def pipeline_commands(self, *commands):
+        """
+        Sends several commands to the FTP server in a single flush, then reads their responses.
+
+        The server processes commands in order, so independent commands don't need to wait for
+        each other's replies; this saves one round trip per additional command.
+
+        :param commands: The FTP commands to send.
+        :return: A list of the server's responses, in the same order as the commands.
+        """
+
+        self.write_commands(*commands)
+        responses = [self.read_response() for _ in commands]
+        return responses
+
     def read_response(self):
         """
         Reads the server's response to a previously sent command.
 
+        Multi-line replies ("123-First line" ... "123 Last line", per RFC 959) are read
+        until the terminating line, so a reply is never split or merged with the next one.
+
         :return: The server's response as a decoded string.
         """
 
-        response = self.control_socket.recv(4096).decode()
+        lines = []
+        code = None
+        while True:
+            line = self.ctrl_rfile.readline()
+            if not line:  # Server closed the control connection
+                break
+            lines.append(line)
+            if code is None:
+                match = _REPLY_CODE_RE.match(line)
+                if match is None or match.group(2) == b' ':
+                    break
+                code = match.group(1)
+            elif line.startswith(code + b' '):
+                break
+
+        response = b''.join(lines).decode()
+        # Every reply is logged here, so callers don't have to echo them
+        logger.debug("%s", response.rstrip())
         return response
 
     def send_ls(self, path="."):
         """
         Requests a listing of the directory contents from the FTP server at the specified path.
 
-        Establishes a data channel by entering passive mode, then sends the LIST command
+        Establishes a data channel in passive mode together with the LIST command
         to receive the directory contents.
 
         :param path: The path of the directory to list. Defaults to the current directory.
         """
 
-        # Enter passive mode to initiate a data connection
-        ip_address, port = self.enter_passive_mode()
+        # Open the data channel and send the LIST command through the control channel
+        data_socket, response = self.open_data_connection(f"LIST {path}")
+        if data_socket is None:
+            return
 
-        # Open a new socket for the data channel
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as data_socket:
-            data_socket.connect((ip_address, port))
-            # Send LIST command and print server's response to control channel command
-            response = self.send_command(f"LIST {path}")
-            print(response)
-            # Read and print the directory listing from the data channel
-            directory_listing = data_socket.recv(4096).decode()
-            print(directory_listing)
+        with data_socket:
+            if not response.startswith('1'):
+                logger.error("Failed to list '%s'. Server response: %s", path, response.rstrip())
+                return
+            # Nothing is sent on a LIST data channel, so half-close it right away
+            data_socket.shutdown(socket.SHUT_WR)
+            # Read the directory listing from the data channel until the server closes it
+            with data_socket.makefile('rb') as sock_file:
+                print(sock_file.read().decode())
+
+        # Read the server's final reply once the data channel is closed
+        self.read_response()
 
     def send_mkdir(self, directory):
         """
@@ -123,9 +408,9 @@ class FTPClient:
         response = self.send_command(f"MKD {directory}")
         # Check if the directory was created successfully
         if response.startswith('257'):
-            print(f"Directory '{directory}' created successfully.")
+            logger.info("Directory '%s' created successfully.", directory)
         else:
-            print(f"Failed to create directory '{directory}'. Server response: {response}")
+            logger.error("Failed to create directory '%s'. Server response: %s", directory, response.rstrip())
 
     def send_rmdir(self, directory):
         """
@@ -140,9 +425,9 @@ class FTPClient:
         response = self.send_command(f"RMD {directory}")
         # Check if the directory was removed successfully
         if response.startswith('250'):
-            print(f"Directory '{directory}' removed successfully.")
+            logger.info("Directory '%s' removed successfully.", directory)
         else:
-            print(f"Failed to remove directory '{directory}'. Server response: {response}")
+            logger.error("Failed to remove directory '%s'. Server response: %s", directory, response.rstrip())
 
     def send_cp(self, source_path, destination_path):
         """
@@ -175,43 +460,126 @@ class FTPClient:
         if source_path.startswith('ftp://'):
             # For FTP source, download the file then delete it from the FTP server
             username, password, path = self.parse_url('cp', [source_path, ''])
-            self.send_retr(path, destination_path)
-            self.send_dele(path)
+            # Only delete the original once the download has completed
+            if self.send_retr(path, destination_path):
+                self.send_dele(path)
         else:
             # For local source, upload the file then delete it locally
             username, password, path = self.parse_url('cp', [destination_path, ''])
-            self.send_stor(source_path, path)
-            Path(source_path).unlink()  # Corrected usage
+            # Only delete the original once the upload has completed
+            if self.send_stor(source_path, path):
+                Path(source_path).unlink()  # Corrected usage
 
-    def enter_passive_mode(self):
+    def open_data_connection(self, command):
         """
-        Initiates passive mode, requesting the FTP server to open a port for data transfer.
-        Parses the server's response to extract the IP address and port number for the data connection.
+        Opens a passive-mode data channel and sends a transfer command (LIST, STOR, RETR) over it.
 
-        :return: A tuple containing the IP address and port number for the data connection.
-        """
+        Once a passive-mode reply from this server has been parsed, the passive-mode command and
+        the transfer command are pipelined in a single write. The server answers the first with
+        the address it is listening on and handles the second once the data connection is made,
+        so the transfer starts without waiting an extra round trip for the passive-mode reply.
+        The first transfer of a session sends them one at a time, so a reply the client can't
+        parse never leaves a transfer command waiting for a data connection that won't come.
 
-        # Send PASV command to the server
-        response = self.send_command("PASV")
-        print("PASV Response:", response)
+        :param command: The transfer command to send.
+        :return: A tuple of the connected data socket and the server's response to the transfer
+                 command, or (None, None) if the data channel could not be opened.
+        """
 
-        # Extract the IP address and port from the response
-        pasv_response_regex = r"(\d+),(\d+),(\d+),(\d+),(\d+),(\d+)"
-        match = re.search(pasv_response_regex, response)
-        if match:
-            ip_parts = match.groups()[:4]
-            port_parts = match.groups()[4:6]
-
-            # The first four numbers are concatenated to form the IP address
-            ip_address = '.'.join(ip_parts)
-            # The last two numbers are used to calculate the port number
-            port = (int(port_parts[0]) * 256) + int(port_parts[1])
-
-            print(f"Data connection info - IPL {ip_address}, Port: {port}")
-            return ip_address, port
+        # PASV can only describe an IPv4 address, so EPSV is used on IPv6 control connections
+        passive_command = "EPSV" if self.control_socket.family == socket.AF_INET6 else "PASV"
+        pipelined = self.pipeline_passive
+        if pipelined:
+            self.write_commands(passive_command, command)
         else:
-            print("Could not parse PASV response.")
+            self.write_commands(passive_command)
+        ip_address, port = self.parse_passive_response(passive_command, self.read_response())
+        if ip_address is None:
+            if pipelined:
+                # Consume the transfer command's reply to keep replies in step
+                self.read_response()
             return None, None
+        # This server's passive-mode replies can be parsed, so later transfers can pipeline
+        self.pipeline_passive = True
+
+        # Open data channel connection to the server
+        data_socket = socket.socket(self.control_socket.family, socket.SOCK_STREAM)
+        try:
+            self._tune_socket(data_socket, data_channel=True)
+            # On IPv6 the data channel is on the control connection's peer (EPSV), so its flow info
+            # and scope ID are carried over; for IPv4 this is just (ip_address, port)
+            data_socket.connect((ip_address, port) + self.peer_address[2:])
+        except OSError as error:
+            data_socket.close()
+            logger.error("Could not open data connection to %s port %d: %s", ip_address, port, error)
+            if pipelined:
+                # Some servers close the passive listener when they refuse the transfer command;
+                # its reply is already on its way, so read it to keep replies in step
+                logger.error("Server response: %s", self.read_response().rstrip())
+            return None, None
+
+        try:
+            if not pipelined:
+                self.write_commands(command)
+            response = self.read_response()
+        except BaseException:
+            data_socket.close()
+            raise
+        return data_socket, response
+
+    def parse_passive_response(self, command, response):
+        """
+        Parses the server's reply to PASV or EPSV to extract the IP address and port number
+        for the data connection.
+
+        Both 227 (PASV) and 229 (EPSV, RFC 2428) replies are understood.
+
+        :param command: The passive-mode command that was sent ('PASV' or 'EPSV').
+        :param response: The server's response to that command.
+        :return: A tuple containing the IP address and port number for the data connection,
+                 or (None, None) if the server's response could not be parsed.
+        """
+
+        # Extract the IP address and port from the response
+        if response.startswith('229'):
+            match = _EPSV_RE.search(response)
+            if match:
+                # EPSV only carries the port; the data connection goes to the control connection's peer
+                ip_address = self.peer_address[0]
+                port = int(match.group(2))
+
+                logger.debug("Data connection info - IP %s, Port: %d", ip_address, port)
+                return ip_address, port
+        elif response.startswith('227'):
+            match = _PASV_RE.search(response)
+            if match:
+                ip_parts = match.groups()[:4]
+                port_parts = match.groups()[4:6]
+
+                # The first four numbers are concatenated to form the IP address
+                ip_address = '.'.join(ip_parts)
+                # The last two numbers are used to calculate the port number
+                port = (int(port_parts[0]) * 256) + int(port_parts[1])
+
+                logger.debug("Data connection info - IP %s, Port: %d", ip_address, port)
+                return ip_address, port
+
+        logger.error("Could not parse %s response.", command)
+        return None, None
+
+    def set_parameters(self, *commands):
+        """
+        Sends session parameter commands such as 'TYPE I', 'MODE S', or 'STRU F', skipping any the
+        server has already accepted on this session. The remaining commands are independent of
+        each other, so they are pipelined.
+
+        :param commands: The parameter commands to send.
+        """
+
+        commands = [command for command in commands if self.parameters.get(command.split()[0]) != command]
+        for command, response in zip(commands, self.pipeline_commands(*commands)):
+            if response.startswith('200'):
+                self.parameters[command.split()[0]] = command
 
     def send_type(self, type_code="I"):
         """
@@ -220,8 +588,7 @@ class FTPClient:
         :param type_code: 'I' for binary mode or 'A' for ASCII mode.
         """
 
-        response = self.send_command(f"TYPE {type_code}")
-        print(response)
+        self.set_parameters(f"TYPE {type_code}")
 
     def send_mode(self, mode="S"):
         """
@@ -230,8 +597,7 @@ class FTPClient:
         :param mode: 'S' for Stream mode.
         """
 
-        response = self.send_command(f"MODE {mode}")
-        print(response)
+        self.set_parameters(f"MODE {mode}")
 
     def send_stru(self, structure="F"):
         """
@@ -240,16 +606,14 @@ class FTPClient:
         :param structure: 'F' for File Structure.
         """
 
-        response = self.send_command(f"STRU {structure}")
-        print(response)
+        self.set_parameters(f"STRU {structure}")
 
     def send_quit(self):
         """
         Sends the QUIT command to the FTP server, which terminates the session.
         """
 
-        response = self.send_command("QUIT")
-        print(response)
+        self.send_command("QUIT")
 
     def send_stor(self, local_file_path, remote_file_path):
         """
@@ -258,30 +622,37 @@ class FTPClient:
 
         :param local_file_path: The path to the local file to be uploaded.
         :param remote_file_path: The path on the FTP server where the file will be stored.
+        :return: True if the server accepted the upload and reported it complete, False otherwise.
         """
 
         # Check if the local file exists before attempting to upload
         if not Path(local_file_path).exists():
-            print(f"Error: File {local_file_path} does not exist.")
-            return
-
-        # Enter passive mode to initiate data transfer
-        ip_address, port = self.enter_passive_mode()
+            logger.error("File %s does not exist.", local_file_path)
+            return False
 
-        # Open data channel connection to the server
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as data_socket:
-            data_socket.connect((ip_address, port))
+        # Open the data channel and send the STOR command to notify the server of the file to be uploaded
+        data_socket, response = self.open_data_connection(f"STOR {remote_file_path}")
+        if data_socket is None:
+            return False
 
-            # Send STOR command through control channel to notify the server of the file to be uploaded
-            self.send_command(f"STOR {remote_file_path}")
+        with data_socket:
+            if not response.startswith('1'):
+                logger.error("Failed to upload '%s'. Server response: %s", local_file_path, response.rstrip())
+                return False
 
-            # Open the local file and read its contents
+            # Open the local file and hand it to the kernel with sendfile(2); CPython
+            # falls back to a send() loop on platforms without it
             with open(local_file_path, 'rb') as file:
-                # Send file contents in chunks to the server
-                data = file.read(4096)
-                while data:
-                    data_socket.sendall(data)
-                    data = file.read(4096)
+                data_socket.sendfile(file)
+            # Signal EOF so the server can finish the transfer promptly
+            data_socket.shutdown(socket.SHUT_WR)
+
+        # Read the server's final reply once the data channel is closed
+        response = self.read_response()
+        if not response.startswith('2'):
+            logger.error("Failed to upload '%s'. Server response: %s", local_file_path, response.rstrip())
+            return False
+        return True
 
     def send_retr(self, remote_file_path, local_file_path):
         """
@@ -290,26 +661,38 @@ class FTPClient:
 
         :param remote_file_path: The path on the FTP server to the file to be downloaded.
         :param local_file_path: The path where the downloaded file will be saved lcoally.
+        :return: True if the server accepted the download and reported it complete, False otherwise.
         """
 
-        # Enter passive mode to prepare for data transfer
-        ip_address, port = self.enter_passive_mode()  # Enter passive mode to get data channel details
+        # Open the data channel and send the RETR command to request the file from the server
+        data_socket, response = self.open_data_connection(f"RETR {remote_file_path}")
+        if data_socket is None:
+            return False
 
-        # Open data channel connection for the file transfer
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as data_socket:
-            data_socket.connect((ip_address, port))
+        with data_socket:
+            if not response.startswith('1'):
+                logger.error("Failed to download '%s'. Server response: %s", remote_file_path, response.rstrip())
+                return False
 
-            # Send RETR command through control channel to request the file from the server
-            self.send_command(f"RETR {remote_file_path}")
+            # Every chunk is read into the same preallocated buffer, so no new bytes object
+            # is created per read
+            buffer = bytearray(self.BUFSIZE)
+            view = memoryview(buffer)
 
-            # Open or create the local file to save the downloaded data
-            with open(local_file_path, 'wb') as file:
-                # Receive file data in chunks from the server and write locally
+            # Open or create the local file and copy the data channel into it until the server closes it
+            with open(local_file_path, 'wb', buffering=self.FILE_BUFSIZE) as file:
                 while True:
-                    data = data_socket.recv(4096)
-                    if not data: # If no more data is received, break the loop
+                    received = data_socket.recv_into(view)
+                    if not received: # The server closed the data channel
                         break
-                    file.write(data)
+                    file.write(view[:received])
+
+        # Read the server's final reply once the data channel is closed
+        response = self.read_response()
+        if not response.startswith('2'):
+            logger.error("Failed to download '%s'. Server response: %s", remote_file_path, response.rstrip())
+            return False
+        return True
 
     def send_dele(self, file_path):
         """
@@ -319,7 +702,9 @@ class FTPClient:
         """
 
         # Send DELE command through control channel and wait for response
-        self.send_command(f"DELE {file_path}")
+        response = self.send_command(f"DELE {file_path}")
+        if not response.startswith('250'):
+            logger.error("Failed to delete '%s'. Server response: %s", file_path, response.rstrip())
 
     def parse_url(self, operation, params):
         """
@@ -342,24 +727,57 @@ class FTPClient:
         else:
             url = params[0]
 
-        # Remove the scheme part of the URL ('ftp://')
-        url_body = url[6:]
+        # Split the URL into its components in one pass; credentials may be percent-encoded
+        parts = urlsplit(url)
+        username = unquote(parts.username or 'anonymous')
+        password = unquote(parts.password or '')
+        # Ensure path starts with '/' or assign '/' as default
+        path = unquote(parts.path or '/')
+
+        return username, password, path
+
 
-        # Extract username by splitting at the first ':' and taking the first part
-        username = url_body.split(':')[0]
+def transfer_many(operation, sources, destination):
+    """
+    Copies or moves several files to a single destination directory, overlapping the transfers.
 
-        # Extract password and the rest of the URL after username
-        password_and_path = url_body.split(':')[1]
+    FTP allows only one transfer at a time per control connection, so the files are shared out
+    between up to MAX_PARALLEL_TRANSFERS sessions that run concurrently. Each session logs in
+    once and then takes files until none are left, so after its first transfer the rest reuse
+    the login and pipeline their passive-mode commands.
 
-        # Further split to separate password from path
-        password = password_and_path.split('@')[0]
+    :param operation: Either 'cp' or 'mv'.
+    :param sources: The source paths. Either all local paths or all FTP URLs.
+    :param destination: The destination directory. An FTP URL for uploads, a local path for downloads.
+    """
 
-        # Ensure path starts with '/' or assign '/' as default
-        if '/' in password_and_path:
-            index = password_and_path.index('/')
-            path = password_and_path[index:]
+    pending = queue.SimpleQueue()
+    for source in sources:
+        if destination.startswith('ftp://'):
+            # A local file name has to be percent-encoded to survive parse_url's urlsplit/unquote
+            name = quote(Path(source).name)
+            pending.put([source, f"{destination.rstrip('/')}/{name}"])
         else:
-            path = '/'
+            # A name taken from an FTP URL is percent-encoded and has to be decoded for the local file
+            name = unquote(urlsplit(source).path.rstrip('/').rsplit('/', 1)[-1])
+            pending.put([source, str(Path(destination) / name)])
 
-        return username, password, path
+    sessions = min(len(sources), MAX_PARALLEL_TRANSFERS)
+    with ThreadPoolExecutor(max_workers=sessions) as executor:
+        # Consume the results so an exception raised in any session is propagated
+        list(executor.map(lambda _: _run_session(operation, pending), range(sessions)))
+
+
+def _run_session(operation, pending):
+    """
+    Runs an operation on a single FTP session for each set of parameters taken from a queue,
+    until the queue is empty.
+    """
 
+    with FTPClient() as client:
+        while True:
+            try:
+                params = pending.get_nowait()
+            except queue.Empty:
+                return
+            client.execute(operation, params)